@@ -5,29 +5,43 @@
 Crumb manipulation utilities
 """
 import os
+import re
+from functools import lru_cache
 from string import Formatter
-from typing import Iterable, Tuple, Dict, Iterator
+from typing import Callable, Iterable, Tuple, Dict, Iterator
 
 _txt_idx = 0
 _fld_idx = 1
 _rgx_idx = 2
 _cnv_idx = 3
 
+# a path item that starts with '{' and ends with '}', see `_is_crumb_arg`
+_crumb_arg_re = re.compile(r'(?:^|{sep})\{{[^{sep}]*\}}(?:{sep}|$)'.format(sep=re.escape(os.path.sep)))
+
+
+@lru_cache(maxsize=1024)
+def _parse_items(crumb_path: str) -> Tuple[Tuple[str, str, str, str], ...]:
+    """ Return the items in `crumb_path` given by string.Formatter as a tuple.
+    The result is cached, a crumb path is parsed only once and then shared
+    by all the functions in this module.
+    """
+    return tuple(Formatter().parse(crumb_path))
+
 
 def _yield_items(crumb_path: str, index=None) -> Iterator[str]:
     """ An iterator over the items in `crumb_path` given by string.Formatter."""
     if index is None:
-        return Formatter().parse(crumb_path)
+        return iter(_parse_items(crumb_path))
 
     # for (literal_text, field_name, format_spec, conversion) in fmt.parse(crumb_path):
     # (txt, fld, fmt, conv)
-    return (items[index] for items in Formatter().parse(crumb_path) if items[index] is not None)
+    return (items[index] for items in _parse_items(crumb_path) if items[index] is not None)
 
 
 def _enum_items(crumb_path: str) -> Iterator[Tuple[int, str]]:
     """ An iterator over the enumerated items, i.e., (index, items) in
     `crumb_path` given by string.Formatter. """
-    yield from enumerate(Formatter().parse(crumb_path))
+    yield from enumerate(_parse_items(crumb_path))
 
 
 def _depth_items(crumb_path: str, index: int = None) -> Iterator[Tuple[int, str]]:
@@ -86,23 +100,41 @@ def _build_path(
     if regexes is None:
         regexes = {}
 
-    path = ''
+    parts = []
     for txt, fld, rgx, conv in _yield_items(crumb_path):
-        path += txt
+        parts.append(txt)
         if fld is None:
             continue
 
         if fld in arg_values:
-            path += arg_values[fld]
+            parts.append(arg_values[fld])
         else:
             regex = regexes.get(fld, rgx) if with_regex else ''
-            path += _format_arg(fld, regex=regex)
+            parts.append(_format_arg(fld, regex=regex))
+
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _path_builder(crumb_path: str) -> Callable[[Dict[str, str]], str]:
+    """ Return a function that builds `crumb_path` with the values in a dict
+    of arg_name -> arg_value, as `_build_path` does with `with_regex=True`.
+    `crumb_path` is parsed only once, here, and the function is cached.
+    """
+    items = [(txt, fld, _format_arg(fld, regex=rgx) if fld is not None else '')
+             for txt, fld, rgx, conv in _yield_items(crumb_path)]
 
-    return path
+    def build(arg_values: Dict[str, str]) -> str:
+        return ''.join(txt + (arg_values.get(fld, arg) if fld is not None else '')
+                       for txt, fld, arg in items)
 
+    return build
 
+
+@lru_cache(maxsize=1024)
 def is_valid(crumb_path: str) -> bool:
-    """ Return True if `crumb_path` is a valid Crumb value, False otherwise. """
+    """ Return True if `crumb_path` is a valid Crumb value, False otherwise.
+    The result is cached, every new Crumb checks its path with this."""
     try:
         list(_depth_names_regexes(crumb_path))
     except ValueError:
@@ -205,13 +237,7 @@ def has_crumbs(crumb_path: str) -> bool:
     """ Return True if the `crumb_path.split(os.path.sep)` has item which is a
     crumb argument that starts with '{' and ends with '}'."""
     crumb_path = _get_path(crumb_path)
-
-    splt = crumb_path.split(os.path.sep)
-    for i in splt:
-        if _is_crumb_arg(i):
-            return True
-
-    return False
+    return _crumb_arg_re.search(crumb_path) is not None
 
 
 def _split(crumb_path: str) -> Tuple[str, str]:
@@ -220,8 +246,14 @@ def _split(crumb_path: str) -> Tuple[str, str]:
         with the first crumb argument.
         If `crumb_path` starts with an argument, will return ('', crumb_path).
     """
-    crumb_path = _get_path(crumb_path)
+    return _split_path(_get_path(crumb_path))
 
+
+@lru_cache(maxsize=1024)
+def _split_path(crumb_path: str) -> Tuple[str, str]:
+    """ Return `_split` of the path string `crumb_path`. The result is cached,
+    as `Crumb.split` is called again and again on the same paths.
+    """
     if not has_crumbs(crumb_path):
         return crumb_path, ''
 
@@ -278,7 +310,8 @@ def _split_exists(crumb_path: str) -> bool:
     else:
         rpath = str(crumb_path)
 
-    return os.path.exists(rpath) or os.path.islink(rpath)
+    # an existing path or a symlink, even a broken one, with a single lstat
+    return os.path.lexists(rpath)
 
 
 def _check_is_subset(list1: Iterable[str], list2: Iterable[str]):
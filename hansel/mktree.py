@@ -5,10 +5,14 @@
 Crumb class: the smart path model class.
 """
 
-from collections import Mapping
+import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List
 
 import hansel
+from hansel._utils import _path_builder, _split, has_crumbs
 from hansel.utils import CrumbArgsSequences
 
 
@@ -43,25 +47,64 @@ def mktree(crumb: hansel.Crumb, values_map: CrumbArgsSequences) -> List[str]:
     if not isinstance(values_map, (list, dict)):
         raise TypeError("Expected keys in `values_map` to be a Sequence, got {}.".format(type(values_map)))
 
+    arg_names = tuple(crumb.all_args())
+    all_args = frozenset(arg_names)
+
+    # the items of a values_map usually share the same keys, check each set of keys once
+    checked_keys = set()
     paths = []
     for idx, aval in enumerate(values_map):
-        if not isinstance(aval, Mapping):
+        # check for the common dict case before the slower ABC check
+        if type(aval) is not dict and not isinstance(aval, Mapping):
             aval = dict(aval)
 
-        if not set(aval.keys()).issubset(set(crumb.all_args())):
-            raise ValueError("Expected keys in `values_map` item to be a subset of {}, got {}.".format(
-                crumb.all_args(),
-                aval.keys())
-            )
+        keys = frozenset(aval)
+        if keys not in checked_keys:
+            if not all_args.issuperset(keys):
+                raise ValueError("Expected keys in `values_map` item to be a subset of {}, got {}.".format(
+                    arg_names,
+                    aval.keys())
+                )
+
+            rem_deps = crumb._args_open_parents(keys)
+            if rem_deps:
+                raise KeyError("Expected `values_map` item to not leave crumbs alone,"
+                               " you forgot to add: {} in item {}".format(rem_deps, idx))
 
-        rem_deps = crumb._args_open_parents(list(aval.keys()))
-        if rem_deps:
-            raise KeyError("Expected `values_map` item to not leave crumbs alone,"
-                           " you forgot to add: {} in item {}".format(rem_deps, idx))
+            checked_keys.add(keys)
 
         paths.append(crumb.replace(**aval))
 
+    # create each folder once, building the paths from the parsed template
+    build = _path_builder(crumb.path)
+    dirs = set()
     for path in paths:
-        path.touch()
+        nupath = build(path.arg_values)
+        dirs.add(_split(nupath)[0] if has_crumbs(nupath) else nupath)
+
+    # os.makedirs checks every parent of the folder it creates, so the shared
+    # parents are made once and then each folder is made with a single mkdir.
+    # Both release the GIL and tolerate concurrent creation of the same
+    # folder, so each step runs in parallel.
+    parents = {os.path.dirname(d) for d in dirs} - {''}
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # iterate the results only to raise the errors of the workers
+        for _ in executor.map(partial(os.makedirs, exist_ok=True), sorted(parents)):
+            pass
+
+        for _ in executor.map(_mkdir, sorted(dirs)):
+            pass
 
     return paths
+
+
+def _mkdir(path: str):
+    """ Create the folder `path`, whose parent folder must exist.
+    Do nothing if it already exists, as `os.makedirs` with `exist_ok=True`.
+    """
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        if not os.path.isdir(path):
+            raise
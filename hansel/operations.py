@@ -1,11 +1,13 @@
 import itertools
 import os
 import shutil
-from collections import defaultdict, OrderedDict
-from typing import Iterator, List, Tuple, Dict
+import stat
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Tuple, Dict
 
 import hansel
-from hansel.utils import _get_matching_items
+from hansel.utils import _get_matching_items, rm_dups
 
 CrumbArgsMap = Iterator[List[Tuple[str, str]]]
 
@@ -33,24 +35,95 @@ def joint_value_map(crumb: hansel.Crumb, arg_names: Iterator[str], check_exists:
         lists of 2-tuples, where each 2-tuple has the
         shape (arg_name, arg_value).
     """
+    arg_names = list(arg_names)
+
     values_map = []
     for arg_name in arg_names:
         values_map.append(list((arg_name, arg_value)
-                               for arg_value in crumb[arg_name]))
+                               for arg_value in rm_dups(crumb[arg_name])))
 
     if len(arg_names) == 1:
         return [(i,) for i in values_map[0]]
+
+    if not check_exists:
+        values_map_checked = values_map[:]
     else:
-        if not check_exists:
-            values_map_checked = values_map[:]
+        # the values of each argument are unique, so is their product
+        values_map_checked = list(_filter_existing(crumb, itertools.product(*values_map)))
+
+    return sorted(values_map_checked)
+
+
+def _filter_existing(crumb: hansel.Crumb, values_map: CrumbArgsMap) -> Iterator[Tuple[Tuple[str, str], ...]]:
+    """Return the items of `values_map` that fill `crumb` to an existing path.
+
+    When an item fills all the arguments of `crumb`, the folder that contains
+    the resulting path is listed only once for all of its siblings. Any name
+    not found in that listing is checked with `Crumb.exists`.
+
+    Parameters
+    ----------
+    crumb: hansel.Crumb
+
+    values_map: list of sequences of 2-tuples
+
+    Returns
+    -------
+    values_map: generator of sequences of 2-tuples
+        The items of `values_map` that lead to an existing path.
+    """
+    children = {}
+    for args in values_map:
+        cr = crumb.replace(**dict(args))
+        parent, name = os.path.split(cr.path)
+        if cr.has_crumbs() or name in ('', os.curdir, os.pardir):
+            if cr.exists():
+                yield args
+            continue
+
+        if parent not in children:
+            try:
+                with os.scandir(parent or os.curdir) as entries:
+                    children[parent] = {entry.name for entry in entries}
+            except OSError:
+                children[parent] = set()
+
+        if name in children[parent] or cr.exists():
+            yield args
+
+
+def _sorted_intersection(list1: List, list2: List) -> List:
+    """Return the items that are both in `list1` and `list2`.
+    Both lists must be sorted and without duplicates, as the ones returned
+    by `joint_value_map`.
+    """
+    common = []
+    idx1, idx2 = 0, 0
+    while idx1 < len(list1) and idx2 < len(list2):
+        if list1[idx1] < list2[idx2]:
+            idx1 += 1
+        elif list2[idx2] < list1[idx1]:
+            idx2 += 1
         else:
-            args_crumbs = [(args, crumb.replace(**dict(args)))
-                           for args in set(itertools.product(*values_map))]
+            common.append(list1[idx1])
+            idx1 += 1
+            idx2 += 1
+    return common
 
-            values_map_checked = [args for args, cr in args_crumbs
-                                  if cr.exists()]
 
-    return sorted(values_map_checked)
+def _sorted_difference(list1: List, list2: List) -> List:
+    """Return the items of `list1` that are not in `list2`.
+    Both lists must be sorted and without duplicates, as the ones returned
+    by `joint_value_map`.
+    """
+    diff = []
+    idx2 = 0
+    for item in list1:
+        while idx2 < len(list2) and list2[idx2] < item:
+            idx2 += 1
+        if idx2 == len(list2) or list2[idx2] != item:
+            diff.append(item)
+    return diff
 
 
 def intersection(crumb1: hansel.Crumb, crumb2: hansel.Crumb, on: Iterator[str]=None) -> List[str]:
@@ -98,21 +171,22 @@ def intersection(crumb1: hansel.Crumb, crumb2: hansel.Crumb, on: Iterator[str]=N
     if isinstance(on, str):
         on = [on]
 
-    arg_names = list(_get_matching_items(list(crumb1.all_args()), list(crumb2.all_args()), items=on))
+    args1 = list(crumb1.all_args())
+    args2 = list(crumb2.all_args())
+
+    arg_names = list(_get_matching_items(args1, args2, items=on))
 
     if not arg_names:
         raise KeyError("Could not find matching arguments between {} and  {} limited by {}.".format(
-            list(crumb1.all_args()),
-            list(crumb2.all_args()),
+            args1,
+            args2,
             on)
         )
 
     maps1 = joint_value_map(crumb1, arg_names, check_exists=True)
     maps2 = joint_value_map(crumb2, arg_names, check_exists=True)
 
-    intersect = set(maps1) & (set(maps2))
-
-    return sorted(list(intersect))
+    return _sorted_intersection(maps1, maps2)
 
 
 def difference(crumb1: 'hansel.Crumb', crumb2: 'hansel.Crumb', on: Iterator[str] = None) -> List[str]:
@@ -160,22 +234,19 @@ def difference(crumb1: 'hansel.Crumb', crumb2: 'hansel.Crumb', on: Iterator[str]
     if isinstance(on, str):
         on = [on]
 
-    arg_names = list(_get_matching_items(list(crumb1.all_args()),
-                                         list(crumb2.all_args()),
-                                         items=on))
+    args1 = list(crumb1.all_args())
+    args2 = list(crumb2.all_args())
+
+    arg_names = list(_get_matching_items(args1, args2, items=on))
 
     if not arg_names:
         raise KeyError("Could not find matching arguments between "
-                       "{} and  {} limited by {}.".format(list(crumb1.all_args()),
-                                                          list(crumb2.all_args()),
-                                                          on))
+                       "{} and  {} limited by {}.".format(args1, args2, on))
 
     maps1 = joint_value_map(crumb1, arg_names, check_exists=True)
     maps2 = joint_value_map(crumb2, arg_names, check_exists=True)
 
-    diff = set(maps1).difference(set(maps2))
-
-    return sorted(list(diff))
+    return _sorted_difference(maps1, maps2)
 
 
 def valuesmap_to_dict(values_map: CrumbArgsMap) -> Dict[str, List[str]]:
@@ -190,18 +261,30 @@ def valuesmap_to_dict(values_map: CrumbArgsMap) -> Dict[str, List[str]]:
     -------
     adict: dict
         The dictionary with the values in `values_map` in the form of a
-        dictionary.
+        dictionary. The keys keep the order of the first record.
 
     Raises
     ------
     IndexError
-        If the list_of_dicts is empty or can't be indexed.
+        If the `values_map` is empty.
 
     KeyError
         If any list inside the `values_map` doesn't have all the keys in the
         first dict.
     """
-    return append_dict_values([OrderedDict(rec) for rec in values_map])
+    records = iter(values_map)
+    try:
+        first = dict(next(records))
+    except StopIteration:
+        raise IndexError('Could not get the first element of the list.')
+
+    adict = {arg_name: [arg_value] for arg_name, arg_value in first.items()}
+    for rec in records:
+        rec = dict(rec)
+        for arg_name, arg_values in adict.items():
+            arg_values.append(rec[arg_name])
+
+    return adict
 
 
 def append_dict_values(list_of_dicts: Iterator[Dict[str, str]], keys: Iterator[str]=None) -> Dict[str, List[str]]:
@@ -221,7 +304,8 @@ def append_dict_values(list_of_dicts: Iterator[Dict[str, str]], keys: Iterator[s
         If None will use all keys in the first element of list_of_dicts
     Returns
     -------
-    DefaultOrderedDict of lists
+    dict of lists
+        In the same order as `keys`.
 
     Raises
     ------
@@ -238,28 +322,37 @@ def append_dict_values(list_of_dicts: Iterator[Dict[str, str]], keys: Iterator[s
         except IndexError:
             raise IndexError('Could not get the first element of the list.')
 
-    dict_of_lists = defaultdict(list)
-    for d in list_of_dicts:
-        for k in keys:
-            dict_of_lists[k].append(d[k])
-    return dict_of_lists
+    return {k: [d[k] for d in list_of_dicts] for k in keys}
 
 
 def copy_args(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb):
     """Will copy the argument values of `src_crumb` to the open arguments of
     `dst_crumb`.
     """
+    src_values = src_crumb.arg_values
+    if any(True for _ in src_crumb.open_args()):
+        # a single listing gives a value to all the open arguments of `src_crumb`
+        src_values = src_crumb.ls()[0].arg_values
+
     for arg_name in dst_crumb.open_args():
-        dst_crumb[arg_name] = src_crumb[arg_name][0]
+        if arg_name in src_values:
+            dst_crumb[arg_name] = src_values[arg_name]
+        else:
+            dst_crumb[arg_name] = src_crumb[arg_name][0]
 
 
-def _remove_if_ok_and_exists(path: str, exist_ok: bool):
-    """ Raise FileExistError if the path exists and exist_ok is False."""
-    if not exist_ok and os.path.exists(path):
+def _remove_if_ok_and_exists(path: str, exist_ok: bool, dir_fd: int = None):
+    """ Raise FileExistError if the path exists and exist_ok is False.
+    If `dir_fd` is given, `path` is relative to that open folder."""
+    try:
+        os.lstat(path, dir_fd=dir_fd)
+    except FileNotFoundError:
+        return
+
+    if not exist_ok:
         raise FileExistsError('Path {} already exists.'.format(path))
 
-    if os.path.exists(path):
-        os.remove(path)
+    os.remove(path, dir_fd=dir_fd)
 
 
 def copy_all_files(src_path: str, dst_path: str, exist_ok: bool=True, verbose: bool=False):
@@ -270,12 +363,15 @@ def copy_all_files(src_path: str, dst_path: str, exist_ok: bool=True, verbose: b
     if verbose:
         print("Copying {} -> {}".format(src_path, dst_path))
 
-    if os.path.isdir(src_path):
-        if exist_ok:
-            shutil.rmtree(dst_path)
+    try:
+        src_mode = os.stat(src_path).st_mode
+    except FileNotFoundError:
+        return
 
-        shutil.copytree(src_path, dst_path, copy_function=copy_func)
-    elif os.path.isfile(src_path):
+    if stat.S_ISDIR(src_mode):
+        # raises FileExistsError if `dst_path` exists and not `exist_ok`
+        shutil.copytree(src_path, dst_path, copy_function=copy_func, dirs_exist_ok=exist_ok)
+    elif stat.S_ISREG(src_mode):
         os.makedirs(os.path.dirname(dst_path), exist_ok=exist_ok)
         try:
             copy_func(src_path, dst_path, follow_symlinks=True)
@@ -286,18 +382,49 @@ def copy_all_files(src_path: str, dst_path: str, exist_ok: bool=True, verbose: b
 
 def link_all_files(src_path: str, dst_path: str, exist_ok: bool=True, verbose: bool=False):
     """Make link from src_path to dst_path."""
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    _link_file(src_path, dst_path, exist_ok=exist_ok, verbose=verbose)
+
+
+def _link_file(src_path: str, dst_path: str, exist_ok: bool=True, verbose: bool=False):
+    """Make link from src_path to dst_path. The folder of `dst_path` must exist."""
     if not os.path.isabs(src_path):
         src_path = os.path.relpath(src_path, os.path.dirname(dst_path))
 
     if verbose:
         print("Linking {} -> {}".format(src_path, dst_path))
 
-    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-
     _remove_if_ok_and_exists(dst_path, exist_ok=exist_ok)
     os.symlink(src_path, dst_path)
 
 
+def _link_files_in_dir(dst_dir: str, paths: List[Tuple[str, str]], exist_ok: bool=True, verbose: bool=False):
+    """Make a link for each (src_path, dst_path) in `paths`, all of them with
+    `dst_dir` as the folder of `dst_path`. The folder must exist.
+    Where the platform allows it, `dst_dir` is opened once and the links are
+    made relative to it, so its path is not resolved again for each link.
+    """
+    if not {os.stat, os.unlink, os.symlink} <= os.supports_dir_fd:
+        for src_path, dst_path in paths:
+            _link_file(src_path, dst_path, exist_ok=exist_ok, verbose=verbose)
+        return
+
+    dir_fd = os.open(dst_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        for src_path, dst_path in paths:
+            if not os.path.isabs(src_path):
+                src_path = os.path.relpath(src_path, dst_dir)
+
+            if verbose:
+                print("Linking {} -> {}".format(src_path, dst_path))
+
+            dst_name = os.path.basename(dst_path)
+            _remove_if_ok_and_exists(dst_name, exist_ok=exist_ok, dir_fd=dir_fd)
+            os.symlink(src_path, dst_name, dir_fd=dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
 def _crumb_fill_dst(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb) -> Iterator[Tuple[hansel.Crumb, hansel.Crumb]]:
     """ Will list `src_crumb` and copy the resulting item arguments into
     `dst_crumb`.
@@ -313,6 +440,25 @@ def _crumb_fill_dst(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb) -> Iterato
         yield src, dst
 
 
+def _filled_dst_paths(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb) -> List[Tuple[str, str]]:
+    """Return the list of (source path, destination path) given by
+    `_crumb_fill_dst`.
+    All the pairs are built at once, so an incomplete `dst_crumb` raises
+    before anything is copied or linked.
+    """
+    return [(src.path, dst.path) for src, dst in _crumb_fill_dst(src_crumb, dst_crumb)]
+
+
+def _map_in_threads(func: Callable, args_list: List[Tuple], **kwargs):
+    """Call `func(*args, **kwargs)` for each tuple of `args` in `args_list`,
+    in a pool of threads."""
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # iterate the results only to raise the errors of the workers
+        for _ in executor.map(lambda args: func(*args, **kwargs), args_list):
+            pass
+
+
 def crumb_copy(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb, exist_ok: bool=False, verbose: bool=False):
     """Will copy the content of `src_crumb` into `dst_crumb` folder.
     For this `src_crumb` and `dst_crumb` must have similar set of argument
@@ -320,8 +466,8 @@ def crumb_copy(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb, exist_ok: bool=
     All the defined arguments of `src_crumb.ls()[0]` must define `dst_crumb`
     entirely and create a path to a file or folder.
     """
-    for src, dst in _crumb_fill_dst(src_crumb, dst_crumb):
-        copy_all_files(src.path, dst.path, exist_ok=exist_ok, verbose=verbose)
+    paths = _filled_dst_paths(src_crumb, dst_crumb)
+    _map_in_threads(copy_all_files, paths, exist_ok=exist_ok, verbose=verbose)
 
 
 def crumb_link(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb, exist_ok: bool=False, verbose: bool=False):
@@ -333,8 +479,15 @@ def crumb_link(src_crumb: hansel.Crumb, dst_crumb: hansel.Crumb, exist_ok: bool=
     It will create the folder structure in the base of `dst_crumb` and link
     exclusively the leaf nodes.
     """
-    for src, dst in _crumb_fill_dst(src_crumb, dst_crumb):
-        link_all_files(src.path, dst.path, exist_ok=exist_ok, verbose=verbose)
+    dir_paths = defaultdict(list)
+    for src_path, dst_path in _filled_dst_paths(src_crumb, dst_crumb):
+        dir_paths[os.path.dirname(dst_path)].append((src_path, dst_path))
+
+    # create each destination folder once, not once per link
+    for dst_dir in sorted(dir_paths):
+        os.makedirs(dst_dir, exist_ok=True)
+
+    _map_in_threads(_link_files_in_dir, sorted(dir_paths.items()), exist_ok=exist_ok, verbose=verbose)
 
 
 def groupby_pattern(
@@ -366,15 +519,24 @@ def groupby_pattern(
     if arg_name not in crumb:
         raise KeyError('Crumb {} has no argument {}.'.format(crumb, arg_name))
 
-    paths_matched = set()
+    # list the folder tree once and match each group pattern in memory
+    unpatterned = crumb.copy()
+    unpatterned.clear_pattern(arg_name)
+    values_map = unpatterned.values_map(arg_name, check_exists=True)
+    arg_values = [dict(rec)[arg_name] for rec in values_map]
+    filter_args = crumb._re_args or ()
+
     mods = defaultdict(list)
     for mod_name, pattern in groups.items():
-        crumb.set_pattern(arg_name, pattern)
-        paths = crumb.ls(arg_name)
-        if paths:
-            mods[mod_name] = paths
-            paths_matched = paths_matched.union(paths)
-
-        crumb.clear_pattern(arg_name)
+        matches = set(crumb._match_filter(pattern, arg_values, *filter_args))
+        if not matches:
+            continue
+
+        group_crumb = unpatterned.copy()
+        group_crumb.set_pattern(arg_name, pattern)
+        mods[mod_name] = sorted(group_crumb.build_paths(
+            (rec for rec, value in zip(values_map, arg_values) if value in matches),
+            make_crumbs=True
+        ))
 
     return mods
@@ -26,7 +26,7 @@ def _pandas_rename_cols(df: 'pandas.DataFrame', col_map: Dict[str, str]) -> 'pan
     -------
     renamed: pandas.DataFrame
     """
-    renamed = df.copy()
+    renamed = df.copy(deep=False)  # share the data, only the labels change
     renamed.columns = [col_map.get(col_name, col_name) for col_name in df.columns]
     return renamed
 
@@ -63,7 +63,9 @@ def df_to_valuesmap(
                                       arg_names)
 
     # get the columns of df that have been matched
-    return (list(rec.items()) for rec in df[crumb_names].to_dict(orient='records'))
+    crumb_names = list(crumb_names)
+    return (list(zip(crumb_names, row))
+            for row in df[crumb_names].itertuples(index=False, name=None))
 
 
 def pandas_fill_crumbs(
@@ -1,6 +1,4 @@
 import os
-import tempfile
-import shutil
 from typing import Dict
 
 import pytest
@@ -9,8 +7,9 @@ from hansel import Crumb, mktree
 from hansel.utils import ParameterGrid, CrumbArgsSequences
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def crumb():
+    # shared by the tests of a module, tests that modify it must work on a copy
     yield Crumb("{base_dir}/raw/{subject_id}/{session_id}/{modality}/{image}")
 
 
@@ -21,8 +20,9 @@ def tmp_crumb(base_dir):
 
 
 @pytest.fixture
-def base_dir():
-    yield tempfile.mkdtemp(prefix='crumbtest_')
+def base_dir(tmp_path_factory):
+    # pytest removes its base temporary folder, no need to clean it here
+    yield str(tmp_path_factory.mktemp('crumbtest_'))
 
 
 @pytest.fixture
@@ -38,6 +38,20 @@ def brain_data_crumb_args():
     yield crumb_path, values_dict
 
 
+def existing_paths(root: str) -> set:
+    """ Return the set of `root` and all the paths under it, walking the
+    tree with one `os.scandir` call per folder."""
+    paths = {root}
+    folders = [root]
+    while folders:
+        with os.scandir(folders.pop()) as entries:
+            for entry in entries:
+                paths.add(entry.path)
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.path)
+    return paths
+
+
 def make_tree_from_crumb(base_path, crumb_path, crumb_args: [Dict, CrumbArgsSequences]):
     crumb = Crumb(crumb_path)
     crumb2 = crumb.replace(base_dir=base_path)
@@ -62,4 +76,3 @@ def make_tree_from_crumb(base_path, crumb_path, crumb_args: [Dict, CrumbArgsSequ
 def tmp_tree_crumb(base_dir, brain_data_crumb_args):
     crumb_path, values_dict = brain_data_crumb_args
     yield make_tree_from_crumb(base_dir, crumb_path, values_dict)
-    shutil.rmtree(base_dir)
@@ -1,4 +1,4 @@
-from hansel._utils import _yield_items
+from hansel._utils import _build_path, _parse_items, _path_builder, _yield_items, is_valid
 
 
 def test__yield_items():
@@ -8,3 +8,21 @@ def test__yield_items():
            list(_yield_items("/data/{crumb}/file/{img}"))
 
     assert [('/data/crumb/file/img', None, None, None)] == list(_yield_items('/data/crumb/file/img'))
+
+
+def test__path_builder():
+    crumb_path = "/data/{subject_id}/{session_id:sess*}/{image}"
+    build = _path_builder(crumb_path)
+
+    for arg_values in ({}, {'subject_id': 'hansel'}, {'subject_id': 'hansel', 'image': 'anat.nii'}):
+        assert build(arg_values) == _build_path(crumb_path, arg_values=arg_values, with_regex=True)
+
+
+def test__parse_items():
+    crumb_path = "/data/{crumb}/file/{img}"
+    assert _parse_items(crumb_path) is _parse_items(crumb_path)
+    assert list(_parse_items(crumb_path)) == list(_yield_items(crumb_path))
+
+    # invalid paths raise on every call, they are not cached
+    assert not is_valid("/data/{crumb/file")
+    assert not is_valid("/data/{crumb/file")
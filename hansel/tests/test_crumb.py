@@ -2,12 +2,8 @@ import pytest
 
 import os
 import shutil
-import tempfile
-
-try:
-    from pathlib2 import Path
-except ImportError:
-    from pathlib import Path
+from collections import Counter
+from pathlib import Path
 
 from hansel import Crumb, mktree
 from hansel.utils import ParameterGrid
@@ -22,10 +18,41 @@ from hansel._utils import (
     _split_exists,
 )
 
-from hansel.tests.conftest import tmp_crumb
+from hansel.tests.conftest import tmp_crumb, existing_paths
+
+
+HOME = os.path.expanduser('~')
+BASE_DIR = os.path.join(HOME, 'data', 'cobre')
+HOME_FILES_PATH = os.path.join(HOME, '{user_folder}', '{files}')
+
+TREE_VALUES = {
+    'session_id': ['session_{:02}'.format(i) for i in range(2)],
+    'subject_id': ['subj_{:03}'.format(i) for i in range(3)],
+    'modality': ['anat'],
+    'image': ['mprage1.nii', 'mprage2.nii', 'mprage3.nii'],
+}
+TREE_GRID = list(ParameterGrid(TREE_VALUES))
+
+REGEX_VALUES = {
+    'session_id': ['session_{:02}'.format(i) for i in range(2)],
+    'subject_id': ['subj_{:03}'.format(i) for i in range(100)],
+    'modality': ['anat'],
+    'image': ['mprage1.nii'],
+}
+REGEX_GRID = list(ParameterGrid(REGEX_VALUES))
+
 
+def _scan(path):
+    """ Return a list of (name, is_dir) of the entries in `path`,
+    using one `os.scandir` call."""
+    with os.scandir(path) as entries:
+        return [(entry.name, entry.is_dir()) for entry in entries]
 
-BASE_DIR = os.path.expanduser('~/data/cobre')
+
+@pytest.fixture(scope='module')
+def cobre_crumb(crumb):
+    # `crumb` with BASE_DIR as base_dir, replaced once for the module
+    yield crumb.replace(base_dir=BASE_DIR)
 
 
 def test__get_path(tmp_crumb):
@@ -37,6 +64,7 @@ def test__get_path(tmp_crumb):
 
 
 def test_path_property(crumb):
+    crumb = crumb.copy()
     assert crumb.path == crumb._path
 
     base_dir = BASE_DIR
@@ -84,6 +112,7 @@ def test_copy_equal(crumb):
 
 
 def test_replace_and_setitem(crumb):
+    crumb = crumb.copy()
     # crumb = Crumb("{base_dir}/raw/{subject_id}/{session_id}/{modality}/{image}")
     args = list(_arg_names(crumb.path))
     assert list(crumb.open_args()) == args
@@ -130,48 +159,38 @@ def test_replace_and_setitem(crumb):
     pytest.raises(ValueError, crumb2.replace, subject_id=[])
 
 
-def test_firstarg(crumb):
+def test_firstarg(crumb, cobre_crumb):
     ai, an = crumb._first_open_arg()
     assert an == 'base_dir'
     assert ai == 0
 
-    base_dir = BASE_DIR
-    crumb2 = crumb.replace(base_dir=base_dir)
-
-    ai, an = crumb2._first_open_arg()
+    ai, an = cobre_crumb._first_open_arg()
     assert an == 'subject_id'
-    assert ai == len(base_dir.split(os.path.sep)) + 1
+    assert ai == len(BASE_DIR.split(os.path.sep)) + 1
 
 
-def test_lastarg(crumb):
+def test_lastarg(crumb, cobre_crumb):
     ai, an = crumb._last_open_arg()
     assert an == 'image'
     assert ai == len(crumb.path.split('/')) - 1
 
-    base_dir = BASE_DIR
-    crumb2 = crumb.replace(base_dir=base_dir)
-
-    ai, an = crumb2._last_open_arg()
+    ai, an = cobre_crumb._last_open_arg()
     assert an == 'image'
-    assert ai == len(crumb2.path.split('/')) - 1
-
+    assert ai == len(cobre_crumb.path.split('/')) - 1
 
-def test_isabs(crumb):
-    base_dir = BASE_DIR
-    crumb2 = crumb.replace(base_dir=base_dir)
 
+def test_isabs(crumb, cobre_crumb):
     assert not crumb.isabs()
-    assert crumb2.isabs()
+    assert cobre_crumb.isabs()
 
 
-def test_argnames_order(crumb):
-    base_dir = BASE_DIR
-    crumb2 = crumb.replace(base_dir=base_dir)
-
-    assert sorted(list(_depth_names(crumb.path))) == list(_depth_names(crumb.path))
-    assert sorted(list(_depth_names(crumb2.path))) == list(_depth_names(crumb2.path))
+def test_argnames_order(crumb, cobre_crumb):
+    for cr in (crumb, cobre_crumb):
+        depth_names = list(_depth_names(cr.path))
+        assert all(dn1 <= dn2 for dn1, dn2 in zip(depth_names, depth_names[1:]))
 
-    assert [arg_name for depth, arg_name in sorted(list(_depth_names(crumb2.path)))] == list(_arg_names(crumb2.path))
+    # depth_names is sorted, so it is already in the order of the path
+    assert [arg_name for depth, arg_name in depth_names] == list(_arg_names(cobre_crumb.path))
 
 
 def test_abspath(crumb):
@@ -189,8 +208,8 @@ def test_abspath(crumb):
 
     assert crumb3 != crumb2
 
-    home_crumb = Crumb(os.path.expanduser('~'), ignore_list=['a*'])
-    assert home_crumb._abspath() == os.path.expanduser('~')
+    home_crumb = Crumb(HOME, ignore_list=['a*'])
+    assert home_crumb._abspath() == HOME
 
     abs_home_crumb = home_crumb.abspath()
     assert abs_home_crumb._ignore == ['a*']
@@ -213,9 +232,9 @@ def test_abspath2():
     username = getpass.getuser()
     user_folder = os.path.join('{base}', username)
     old_dir = os.getcwd()
-    os.chdir(os.path.join(os.path.expanduser('~'), '..'))
+    os.chdir(os.path.join(HOME, '..'))
     home_crumb = Crumb(user_folder, ignore_list=['a*'])
-    assert home_crumb._abspath(first_is_basedir=True) == os.path.expanduser('~')
+    assert home_crumb._abspath(first_is_basedir=True) == HOME
 
     abs_home_crumb = home_crumb.abspath()
     assert abs_home_crumb._ignore == ['a*']
@@ -235,10 +254,19 @@ def test_copy(crumb):
 
     assert copy is not copy2
 
+    import copy as copy_module
+    copy3 = copy_module.copy(crumb)
+    assert crumb is not copy3
+    assert crumb == copy3
+
+    copy3['base_dir'] = BASE_DIR
+    assert not crumb.has_set('base_dir')
+
     pytest.raises(TypeError, crumb.copy, {})
 
 
 def test_equal_no_copy(crumb):
+    crumb = crumb.copy()
     crumb2 = crumb
     assert crumb2 == crumb
 
@@ -316,6 +344,7 @@ def test_from_path(crumb):
 
 
 def test_is_valid_a_bit(crumb):
+    crumb = crumb.copy()
     assert crumb.is_valid()
 
     crumb_path = crumb._path
@@ -325,7 +354,7 @@ def test_is_valid_a_bit(crumb):
     pytest.raises(TypeError, crumb.from_path, {})
 
     assert not crumb.is_valid(crumb_path)
-    assert crumb.is_valid(os.path.expanduser('~'))
+    assert crumb.is_valid(HOME)
 
     crumb._path = crumb_path
     pytest.raises(ValueError, _check, crumb_path)
@@ -338,7 +367,7 @@ def test_is_valid_a_bit(crumb):
 
 
 def test_arg_name():
-    assert not _is_crumb_arg(Path(os.path.expanduser('~')))
+    assert not _is_crumb_arg(Path(HOME))
 
 
 def test_has_crumbs(crumb):
@@ -359,21 +388,25 @@ def test_ls_raises():
 
     pytest.raises(NotImplementedError, crumb.ls, 'home')
 
-    crumb['home'] = os.path.expanduser('~')
+    crumb['home'] = HOME
 
     pytest.raises(ValueError, crumb.ls, '', fullpath=False)
 
 
 def test_ls_and_getitem():
-    base_dir = os.path.expanduser('~')
+    base_dir = HOME
     crumb = Crumb(os.path.join(base_dir, '{user_folder}'))
 
+    entries = _scan(base_dir)
+    names = frozenset(name for name, _ in entries)
+    folder_names = frozenset(name for name, is_dir in entries if is_dir)
+
     lst = crumb.ls('user_folder', fullpath=False, make_crumbs=False, check_exists=False)
-    assert set(lst) == set(os.listdir(base_dir))
+    assert len(lst) == len(names) and frozenset(lst) == names
 
-    crumb = Crumb(os.path.join(base_dir, '{user_folder}', '{files}'))
+    crumb = Crumb(HOME_FILES_PATH)
     lst = crumb.ls('user_folder', fullpath=False, make_crumbs=False, check_exists=False)
-    assert set(lst) == set([d for d in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, d))])
+    assert len(lst) == len(folder_names) and frozenset(lst) == folder_names
 
     flst = crumb.ls('user_folder', fullpath=True, make_crumbs=False, check_exists=False)
     assert all([isinstance(f, str) for f in flst])
@@ -381,7 +414,7 @@ def test_ls_and_getitem():
 
     flst = crumb.ls('files', fullpath=True, make_crumbs=False, check_exists=False)
     assert all([isinstance(f, str) for f in flst])
-    assert all([os.path.exists(f) or os.path.islink(f) for f in flst])
+    assert all([os.path.lexists(f) for f in flst])
 
     flst = crumb.ls('files', fullpath=True, make_crumbs=True, check_exists=False)
     assert all([f.exists() or f.is_symlink() for f in flst])
@@ -393,9 +426,9 @@ def test_ls_and_getitem():
 
 
 def test_ls3():
-    from glob import glob
-    base_dir = os.path.expanduser('~')
-    files = [d for d in glob(os.path.join(base_dir, '*')) if os.path.isfile(d)]
+    base_dir = HOME
+    with os.scandir(base_dir) as entries:
+        files = [entry.path for entry in entries if not entry.name.startswith('.') and entry.is_file()]
     crumb = Crumb(os.path.join(files[0], '{user_folder}', '{files}'))
     lst = crumb.ls('user_folder')
     assert not lst
@@ -407,14 +440,13 @@ def test_ls3():
 def test_ignore_lst():
     import fnmatch
 
-    base_dir = os.path.expanduser('~')
-    crumb = Crumb(os.path.join(base_dir, '{user_folder}', '{files}'))
+    crumb = Crumb(HOME_FILES_PATH)
 
     folders = crumb['user_folder']  # set(fnmatch.filter(crumb['user_folder'], '.*'))
 
-    ign_crumb = Crumb(os.path.join(base_dir, '{user_folder}', '{files}'), ignore_list=('.*',))
+    ign_crumb = Crumb(HOME_FILES_PATH, ignore_list=('.*',))
     ign_folders = ign_crumb['user_folder']
-    assert set(ign_folders) == set([item for item in folders if not fnmatch.fnmatch(item, '.*')])
+    assert set(ign_folders) == set(folders) - set(fnmatch.filter(folders, '.*'))
     assert set(folders) > set(ign_folders)
 
     uign_crumb = ign_crumb.unfold()
@@ -450,8 +482,7 @@ def test_touch(tmp_crumb):
     assert os.path.exists(path)
 
 
-def test_touch2():
-    base_dir = tempfile.mkdtemp()
+def test_touch2(base_dir):
     path = os.path.join(base_dir, 'hansel')
 
     assert not os.path.exists(path)
@@ -473,18 +504,12 @@ def test_arg_values(tmp_crumb):
 
 
 def test_exists(tmp_crumb):
-    assert not os.path.exists(tmp_crumb.split()[0])
-
-    values_dict = {
-        'session_id': ['session_{:02}'.format(i) for i in range(2)],
-        'subject_id': ['subj_{:03}'.format(i) for i in range(3)],
-        'modality': ['anat'],
-        'image': ['mprage1.nii', 'mprage2.nii', 'mprage3.nii'],
-    }
+    assert not os.path.lexists(tmp_crumb.split()[0])
 
+    # with a missing base folder, `exists` must return before listing anything
     assert not tmp_crumb.exists()
 
-    mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    mktree(tmp_crumb, TREE_GRID)
 
     assert tmp_crumb.exists()
 
@@ -492,7 +517,7 @@ def test_exists(tmp_crumb):
 
 
 def test_exists2(tmp_crumb):
-    assert not os.path.exists(tmp_crumb.split()[0])
+    assert not os.path.lexists(tmp_crumb.split()[0])
 
     values_dict = {
         'session_id': ['session_{:02}'.format(i) for i in range(2)],
@@ -507,22 +532,15 @@ def test_exists2(tmp_crumb):
 def test_setitem(tmp_crumb):
     assert not os.path.exists(tmp_crumb.split()[0])
 
-    values_dict = {
-        'session_id': ['session_{:02}'.format(i) for i in range(2)],
-        'subject_id': ['subj_{:03}'.format(i) for i in range(3)],
-        'modality': ['anat'],
-        'image': ['mprage1.nii', 'mprage2.nii', 'mprage3.nii'],
-    }
-
     assert not tmp_crumb.exists()
 
-    mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    mktree(tmp_crumb, TREE_GRID)
 
     cr = list(tmp_crumb.ls())[0]
 
     assert not list(cr.open_args())
 
-    assert cr['image'] == [values_dict['image'][0]]
+    assert cr['image'] == [TREE_VALUES['image'][0]]
 
     cr['image'] = 'mprage2.nii'
 
@@ -552,23 +570,19 @@ def test_contains(tmp_crumb):
 
 
 def test_ls_with_check(tmp_crumb):
-    assert not os.path.exists(tmp_crumb._path)
-
-    values_dict = {
-        'session_id': ['session_{:02}'.format(i) for i in range(2)],
-        'subject_id': ['subj_{:03}'.format(i) for i in range(3)],
-        'modality': ['anat'],
-        'image': ['mprage1.nii', 'mprage2.nii', 'mprage3.nii'],
-    }
+    root = tmp_crumb.split()[0]
+    assert not os.path.lexists(root)
+    assert not tmp_crumb.exists()
 
-    paths = mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    paths = mktree(tmp_crumb, TREE_GRID)
 
     sbj_crumb = tmp_crumb.replace(subject_id='subj_000')
     assert sbj_crumb.ls('subject_id', make_crumbs=False, fullpath=False) == ['subj_000']
 
-    assert os.path.exists(tmp_crumb.split()[0])
+    assert os.path.exists(root)
 
-    assert all([os.path.exists(p.path) for p in paths])
+    present = existing_paths(root)
+    assert all([p.path in present for p in paths])
     assert all([p.exists() for p in paths])
 
     images = tmp_crumb.ls('image', fullpath=True, make_crumbs=True, check_exists=True)
@@ -578,17 +592,8 @@ def test_ls_with_check(tmp_crumb):
     assert all([img.exists() for img in images])
     assert all([mod.exists() for mod in modalities])
 
-    Path(str(images[0])).rmdir()
-
-    images2 = tmp_crumb.ls('image', fullpath=True, make_crumbs=True, check_exists=True)
-
-    assert images != images2
-    assert len(images) == len(images2) + 1
-    assert not all([img.exists() for img in images])
-    assert all([img.exists() for img in images2])
-
-    Path(str(images[1])).rmdir()
-    Path(str(images[2])).rmdir()
+    for img in images[:3]:
+        os.rmdir(str(img))
 
     images2 = tmp_crumb.ls('image', fullpath=True, make_crumbs=True, check_exists=True)
 
@@ -636,7 +641,8 @@ def test_ls_with_check(tmp_crumb):
     assert img_crumb['modality'] == ['anat']
     assert img_crumb.has_set('modality')
 
-    assert img_crumb['session_id'].count('session_01') == img_crumb['session_id'].count('session_00')
+    session_counts = Counter(img_crumb['session_id'])
+    assert session_counts['session_01'] == session_counts['session_00']
 
     img_crumb['session_id'] = 'session_00'
     assert 'session_id' in img_crumb._argval
@@ -654,14 +660,7 @@ def test_ls_with_check(tmp_crumb):
 def test_regex(tmp_crumb):
     assert not os.path.exists(tmp_crumb.path)
 
-    values_dict = {
-        'session_id': ['session_{:02}'.format(i) for i in range(2)],
-        'subject_id': ['subj_{:03}'.format(i) for i in range(100)],
-        'modality': ['anat'],
-        'image': ['mprage1.nii'],
-    }
-
-    mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    mktree(tmp_crumb, REGEX_GRID)
 
     crumb = Crumb(tmp_crumb.path.replace('{subject_id}', '{subject_id:^subj_02.*$}'), regex='re')  # re.match
 
@@ -733,14 +732,7 @@ def test_regex_ignorecase(tmp_crumb):
 def test_regex_replace(tmp_crumb):
     assert not os.path.exists(tmp_crumb._path)
 
-    values_dict = {
-        'session_id': ['session_{:02}'.format(i) for i in range(2)],
-        'subject_id': ['subj_{:03}'.format(i) for i in range(100)],
-        'modality': ['anat'],
-        'image': ['mprage1.nii'],
-    }
-
-    mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    mktree(tmp_crumb, REGEX_GRID)
 
     crumb = Crumb(tmp_crumb.path.replace('{subject_id}', '{subject_id:subj_02*}'), regex='fnmatch')  # fnmatch
 
@@ -754,20 +746,13 @@ def test_regex_replace(tmp_crumb):
     assert fn_subj_ids == set(['subj_{:03}'.format(i) for i in range(20, 30)])
 
     sessions = {cr['session_id'][0] for cr in anat_crumb.ls('session_id', check_exists=True)}
-    assert sessions == set(values_dict['session_id'])
+    assert sessions == set(REGEX_VALUES['session_id'])
 
 
 def test_regex_replace2(tmp_crumb):
     assert not os.path.exists(tmp_crumb.path)
 
-    values_dict = {
-        'session_id': ['session_{:02}'.format(i) for i in range(2)],
-        'subject_id': ['subj_{:03}'.format(i) for i in range(100)],
-        'modality': ['anat'],
-        'image': ['mprage1.nii'],
-    }
-
-    mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    mktree(tmp_crumb, REGEX_GRID)
 
     # a crumb with the pattern
     crumb = Crumb(tmp_crumb.path.replace('{subject_id}', '{subject_id:subj_02*}'),
@@ -786,13 +771,7 @@ def test_regex_replace2(tmp_crumb):
 def test_set_patterns(tmp_crumb):
     assert not os.path.exists(tmp_crumb.path)
 
-    values_dict = {'session_id': ['session_{:02}'.format(i) for i in range(2)],
-                   'subject_id': ['subj_{:03}'.format(i) for i in range(100)],
-                   'modality': ['anat'],
-                   'image': ['mprage1.nii'],
-                   }
-
-    mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    mktree(tmp_crumb, REGEX_GRID)
 
     # a crumb without the pattern, the pattern is added later
     crumb2 = Crumb(tmp_crumb.path, regex='fnmatch')
@@ -813,14 +792,7 @@ def test_has_files(tmp_crumb):
 
     assert not tmp_crumb.has_files()
 
-    values_dict = {
-        'session_id': ['session_{:02}'.format(i) for i in range(2)],
-        'subject_id': ['subj_{:03}'.format(i) for i in range(3)],
-        'modality': ['anat'],
-        'image': ['mprage1.nii', 'mprage2.nii', 'mprage3.nii'],
-    }
-
-    paths = mktree(tmp_crumb, list(ParameterGrid(values_dict)))
+    paths = mktree(tmp_crumb, TREE_GRID)
 
     assert os.path.exists(tmp_crumb.split()[0])
 
@@ -4,20 +4,24 @@ import os
 
 from hansel import mktree
 from hansel.utils import ParameterGrid
+from hansel.tests.conftest import existing_paths
 
 
 def test_mktree1(tmp_crumb):
-    assert not os.path.exists(tmp_crumb.split()[0])
+    root = tmp_crumb.split()[0]
+    assert not os.path.exists(root)
 
     nupaths = mktree(tmp_crumb, None)
 
-    assert all([os.path.exists(npath) for npath in nupaths])
+    present = existing_paths(root)
+    assert all([npath in present for npath in nupaths])
 
     pytest.raises(TypeError, mktree, tmp_crumb, 'hansel')
 
 
 def test_mktree_dicts(tmp_crumb):
-    assert not os.path.exists(tmp_crumb.split()[0])
+    root = tmp_crumb.split()[0]
+    assert not os.path.exists(root)
 
     values_map = {
         'session_id': ['session_{}'.format(i) for i in range(2)],
@@ -28,7 +32,8 @@ def test_mktree_dicts(tmp_crumb):
 
     nupaths = mktree(tmp_crumb, list(ParameterGrid(values_map)))
 
-    assert all([os.path.exists(npath.split()[0]) for npath in nupaths])
+    present = existing_paths(root)
+    assert all([npath.split()[0] in present for npath in nupaths])
     assert all([npath.exists() for npath in nupaths])
 
     values_map['grimm'] = ['Jacob', 'Wilhelm']
@@ -36,7 +41,8 @@ def test_mktree_dicts(tmp_crumb):
 
 
 def test_mktree_tuples(tmp_crumb):
-    assert not os.path.exists(tmp_crumb.split()[0])
+    root = tmp_crumb.split()[0]
+    assert not os.path.exists(root)
 
     values_dict = {'session_id': ['session_{:02}'.format(i) for i in range(2)],
                    'subject_id': ['subj_{:03}'.format(i) for i in range(3)],
@@ -53,7 +59,8 @@ def test_mktree_tuples(tmp_crumb):
         for k in values_dict:
             assert k in path
 
-    assert all([os.path.exists(npath.split()[0]) for npath in nupaths])
+    present = existing_paths(root)
+    assert all([npath.split()[0] in present for npath in nupaths])
     assert all([npath.exists() for npath in nupaths])
 
     ls_session_ids = tmp_crumb.ls('session_id', fullpath=False, make_crumbs=False, check_exists=False)
@@ -67,8 +74,8 @@ def test_mktree_raises(tmp_crumb):
     assert not os.path.exists(tmp_crumb.split()[0])
 
     values_dict = {
-        'session_id': ['session_' + str(i) for i in range(2)],
-        'subject_id': ['subj_' + str(i) for i in range(3)],
+        'session_id': [f'session_{i}' for i in range(2)],
+        'subject_id': [f'subj_{i}' for i in range(3)],
         'modality': ['anat', 'rest', 'pet'],
         'image': ['mprage.nii', 'rest.nii', 'pet.nii'],
     }
@@ -1,6 +1,4 @@
 import os
-import tempfile
-from functools import partial
 
 import pytest
 
@@ -16,6 +14,8 @@ from hansel.operations import (
     groupby_pattern,
 )
 
+HOME_FILES_PATH = os.path.expanduser(os.path.join('~', '{files}'))
+
 
 def test_valuesmap_to_dict_raises(tmp_tree_crumb):
     tmp_crumb = tmp_tree_crumb
@@ -58,12 +58,12 @@ def test_valuesmap_to_dict(tmp_tree_crumb, brain_data_crumb_args):
     assert tmp_crumb.values_map('image') == tmp_crumb.values_map()
 
 
-def test_intersection():
+def test_intersection(tmp_path_factory):
     crumb = Crumb("{base_dir}/raw/{subject_id}/{session_id}/{modality}/{image}")
-    base_dir1 = tempfile.mkdtemp(prefix='crumbtest1_')
+    base_dir1 = str(tmp_path_factory.mktemp('crumbtest1_'))
     tmp_crumb1 = crumb.replace(base_dir=base_dir1)
 
-    base_dir2 = tempfile.mkdtemp(prefix='crumbtest2_')
+    base_dir2 = str(tmp_path_factory.mktemp('crumbtest2_'))
     tmp_crumb2 = crumb.replace(base_dir=base_dir2)
 
     assert not os.path.exists(tmp_crumb1._path)
@@ -114,22 +114,28 @@ def test_intersection():
         (('subject_id', 'subj_000'), ('image', 'mprage2.nii')),
         (('subject_id', 'subj_000'), ('image', 'mprage3.nii'))]
 
+    all_args = ['subject_id', 'session_id', 'modality', 'image']
+    assert intersection(tmp_crumb1, tmp_crumb2, on=all_args) == sorted(
+        tuple((arg_name, rec[arg_name]) for arg_name in all_args)
+        for rec in ParameterGrid(values_dict1)
+    )
+
     # test raises
     pytest.raises(KeyError, intersection, tmp_crumb1, tmp_crumb2, on=['hansel'])
 
     pytest.raises(KeyError, intersection, tmp_crumb1, tmp_crumb2, on=['subject_id', 'modality', 'hansel'])
 
-    pytest.raises(KeyError, intersection, tmp_crumb1, Crumb(os.path.expanduser('~/{files}')))
+    pytest.raises(KeyError, intersection, tmp_crumb1, Crumb(HOME_FILES_PATH))
 
-    pytest.raises(KeyError, intersection, tmp_crumb1, Crumb(os.path.expanduser('~/{files}')), on=['files'])
+    pytest.raises(KeyError, intersection, tmp_crumb1, Crumb(HOME_FILES_PATH), on=['files'])
 
 
-def test_difference():
+def test_difference(tmp_path_factory):
     crumb = Crumb("{base_dir}/raw/{subject_id}/{session_id}/{modality}/{image}")
-    base_dir1 = tempfile.mkdtemp(prefix='crumbtest1_')
+    base_dir1 = str(tmp_path_factory.mktemp('crumbtest1_'))
     tmp_crumb1 = crumb.replace(base_dir=base_dir1)
 
-    base_dir2 = tempfile.mkdtemp(prefix='crumbtest2_')
+    base_dir2 = str(tmp_path_factory.mktemp('crumbtest2_'))
     tmp_crumb2 = crumb.replace(base_dir=base_dir2)
 
     assert not os.path.exists(tmp_crumb1._path)
@@ -192,16 +198,16 @@ def test_difference():
                   on=['subject_id', 'modality', 'hansel'])
 
     pytest.raises(KeyError, difference, tmp_crumb1,
-                  Crumb(os.path.expanduser('~/{files}')))
+                  Crumb(HOME_FILES_PATH))
 
     pytest.raises(KeyError, difference, tmp_crumb1,
-                  Crumb(os.path.expanduser('~/{files}')),
+                  Crumb(HOME_FILES_PATH),
                   on=['files'])
 
 
-def test_group_pattern():
+def test_group_pattern(tmp_path_factory):
     crumb = Crumb("{base_dir}/raw/{subject_id}/{session_id}/{image}")
-    base_dir1 = tempfile.mkdtemp(prefix='crumbtest1_')
+    base_dir1 = str(tmp_path_factory.mktemp('crumbtest1_'))
     tmp_crumb1 = crumb.replace(base_dir=base_dir1)
 
     assert not os.path.exists(tmp_crumb1._path)
@@ -231,9 +237,10 @@ def test_group_pattern():
             assert patterns[name] in p.patterns.values()
 
 
-def _test_crumb_copy(make_links=False):
+@pytest.mark.parametrize('make_links', [False, True], ids=['copy', 'link'])
+def test_crumb_copy(tmp_path_factory, make_links):
     crumb = Crumb("{base_dir}/raw/{subject_id}/{session_id}/{image}")
-    base_dir1 = tempfile.mkdtemp(prefix='crumb_copy_test1_')
+    base_dir1 = str(tmp_path_factory.mktemp('crumb_copy_test1_'))
     tmp_crumb1 = crumb.replace(base_dir=base_dir1)
 
     assert not os.path.exists(tmp_crumb1._path)
@@ -247,7 +254,7 @@ def _test_crumb_copy(make_links=False):
 
     mktree(tmp_crumb1, list(ParameterGrid(values_dict1)))
 
-    base_dir2 = tempfile.mkdtemp(prefix='crumb_copy_test2_')
+    base_dir2 = str(tmp_path_factory.mktemp('crumb_copy_test2_'))
     tmp_crumb2 = crumb.replace(base_dir=base_dir2)
 
     if make_links:
@@ -269,7 +276,3 @@ def _test_crumb_copy(make_links=False):
 
     if make_links:
         assert all([os.path.islink(cr.path) for cr in tmp_crumb2.ls()])
-
-
-test_crumb_copy = partial(_test_crumb_copy, make_links=False)
-test_crumb_copy_make_link_dirs = partial(_test_crumb_copy, make_links=True)
@@ -1,4 +1,5 @@
-from collections import Iterable, Sized
+import os
+from collections.abc import Iterable, Sized
 from itertools import chain, product
 
 import pytest
@@ -7,6 +8,9 @@ from hansel.utils import (
     rm_dups,
     ParameterGrid,
     list_intersection,
+    list_children,
+    remove_ignored,
+    fnmatch_filter,
     _get_matching_items,
 )
 
@@ -83,3 +87,38 @@ def test_get_matching_items():
     assert list(_get_matching_items(sessions1, sessions2, items=sessions2)) == sessions2
 
     assert list(_get_matching_items(sessions1, sessions2, items=['hansel'])) == []
+
+
+def test_fnmatch_filter():
+    items = ['mprage.nii', 'pet.nii', 'rest.nii', 'mprage.nii.gz', 'remaining']
+
+    assert list(fnmatch_filter('mprage*', items)) == ['mprage.nii', 'mprage.nii.gz']
+    assert list(fnmatch_filter('*.nii', items)) == ['mprage.nii', 'pet.nii', 'rest.nii']
+    assert list(fnmatch_filter('re?t.nii', items)) == ['rest.nii']
+    assert list(fnmatch_filter('hansel*', items)) == []
+
+    # case sensitivity follows the platform, as in `fnmatch.fnmatch`
+    upper_matches = list(fnmatch_filter('MPRAGE*', items))
+    if os.path.normcase('A') == os.path.normcase('a'):
+        assert upper_matches == ['mprage.nii', 'mprage.nii.gz']
+    else:
+        assert upper_matches == []
+
+
+def test_list_children(tmp_path):
+    (tmp_path / 'folder').mkdir()
+    (tmp_path / 'file.txt').touch()
+
+    assert sorted(list_children(str(tmp_path))) == ['file.txt', 'folder']
+    assert list(list_children(str(tmp_path), just_dirs=True)) == ['folder']
+    assert list(list_children(str(tmp_path / 'file.txt'))) == []
+
+    pytest.raises(FileNotFoundError, list, list_children(str(tmp_path / 'missing')))
+
+
+def test_remove_ignored():
+    items = ['.git', 'anat', 'rest', '.DS_Store', 'anat.bak']
+
+    assert list(remove_ignored('.*', items)) == ['anat', 'rest', 'anat.bak']
+    assert list(remove_ignored(['.*', '*.bak'], items)) == ['anat', 'rest']
+    assert list(remove_ignored(['.*', '*.bak'], iter(items))) == ['anat', 'rest']
@@ -6,7 +6,7 @@ import itertools
 import operator
 import os
 import re
-from collections import Mapping, OrderedDict
+from collections.abc import Mapping
 from functools import partial, reduce
 from typing import Any, Iterator, List, Callable, Tuple
 
@@ -36,7 +36,13 @@ def remove_ignored(ignore: [str, Iterator[str]], strs: Iterator[str]) -> Iterato
     return the result in a list."""
     if isinstance(ignore, str):
         ignore = [ignore]
-    yield from (item for ign in ignore for item in strs if not fnmatch.fnmatch(item, ign))
+
+    strs = list(strs)
+    ignored = set()
+    for ign in ignore:
+        ignored.update(fnmatch.filter(strs, ign))
+
+    yield from (item for item in strs if item not in ignored)
 
 
 def fnmatch_filter(pattern: str, items: Iterator[str], *args) -> Iterator[str]:
@@ -57,7 +63,7 @@ def fnmatch_filter(pattern: str, items: Iterator[str], *args) -> Iterator[str]:
     matches: list of str
         Matched items
     """
-    yield from (item for item in items if fnmatch.fnmatch(item, pattern))
+    yield from fnmatch.filter(items, pattern)
 
 
 def regex_match_filter(pattern: str, items: Iterator[str], *args) -> Iterator[str]:
@@ -95,21 +101,23 @@ def list_children(path: str, just_dirs: bool = False) -> Iterator[str]:
     -------
     paths: list of str
     """
-    if not os.path.exists(path):
+    # one scandir call, the entry types come with the listing
+    try:
+        with os.scandir(path) as entries:
+            if just_dirs:  # this means we have to list only folders
+                children = [entry.name for entry in entries if entry.is_dir()]
+            else:  # this means we have to list files
+                children = [entry.name for entry in entries]
+    except FileNotFoundError:
         raise FileNotFoundError(
             'Expected an existing path, but could not find "{}".'.format(path)
         )
+    except NotADirectoryError:
+        if os.path.isfile(path):
+            return
+        raise
 
-    if os.path.isfile(path):
-        if just_dirs:
-            return []
-        else:
-            return [path]
-    else:
-        if just_dirs:  # this means we have to list only folders
-            yield from (d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d)))
-        else:  # this means we have to list files
-            yield from os.listdir(path)
+    yield from children
 
 
 def list_subpaths(path: str,
@@ -259,9 +267,9 @@ class ParameterGrid(object):
                 yield {}
             else:
                 keys, values = zip(*items)
-                for v in itertools.product(*values):
-                    params = OrderedDict(zip(keys, v))
-                    yield params
+                # plain dicts keep the sorted key order too, and are cheaper
+                # to build than an OrderedDict for every point of the grid
+                yield from (dict(zip(keys, v)) for v in itertools.product(*values))
 
     def __len__(self):
         """Number of points on the grid."""
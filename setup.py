@@ -40,6 +40,7 @@ setup_dict = dict(
     maintainer_email='alexsavio@gmail.com',
     packages=find_packages(exclude=['tests']),
     install_requires=requirements,
+    python_requires='>=3.8',
 
     entry_points='''
       [console_scripts]
@@ -61,7 +62,7 @@ setup_dict = dict(
         'Operating System :: POSIX',
         'Operating System :: Unix',
         'Operating System :: MacOS',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.8',
     ],
 )
 